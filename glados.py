@@ -1,21 +1,23 @@
 import copy
-import json
 import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
 import re
 import sys
 import threading
-import time
 from urllib.parse import urljoin
 
 from pathlib import Path
-from typing import List
-from jinja2 import Template
+from jinja2 import BaseLoader, Environment
 
 import numpy as np
+import orjson
 import requests
 import sounddevice as sd
-from Levenshtein import distance
 from loguru import logger
+from rapidfuzz import process as fuzz_process
+from rapidfuzz.distance import Levenshtein
 
 from glados import asr, llama, tts, vad, config
 
@@ -23,6 +25,20 @@ from glados import asr, llama, tts, vad, config
 logger.remove(0)
 logger.add(sys.stderr, level="INFO")
 
+# Number of preallocated input frames shared between the audio callback and the
+# VAD worker; generous compared to how far the worker can realistically fall behind.
+FRAME_POOL_SIZE = 32
+
+# Strips *inflections*, (actions) and any stray non-alphanumeric characters in a
+# single pass; compiled once rather than re-parsed for every generated sentence.
+_RE_SENTENCE_CLEANUP = re.compile(r"\*.*?\*|\(.*?\)|[^a-zA-Z0-9.,?!;:'\" -]")
+
+# Server-sent-event framing prefix on each streamed completion line.
+_SSE_DATA_PREFIX = b"data: "
+
+# Characters that end a sentence (or clause long enough to hand to the TTS).
+_PAUSE_CHARS = frozenset(".!?:;")
+
 
 class Glados:
     def __init__(
@@ -58,26 +74,90 @@ class Glados:
         self._setup_llama_model()
 
         # Initialize sample queues and state flags
-        self.samples = []
+        self.raw_queue = queue.Queue()
         self.sample_queue = queue.Queue()
-        self.buffer = queue.Queue(maxsize=self._conf.BUFFER_SIZE // self._conf.VAD_SIZE)
+
+        # The utterance being recorded is streamed into one preallocated buffer, so
+        # handing it to the ASR is a zero-copy slice rather than an np.concatenate
+        # over hundreds of per-frame arrays.
+        self._utt_buf = np.empty(
+            self._conf.SAMPLE_RATE * self._conf.MAX_UTTERANCE_SECONDS,
+            dtype=np.float32,
+        )
+        self._utt_off = 0
+
+        # Pre-activation audio is kept in a preallocated ring buffer rather than a
+        # queue.Queue: one frame is written every VAD_SIZE ms forever, so this path
+        # should not pay a lock or a Python object allocation per frame.
+        buffer_frames = self._conf.BUFFER_SIZE // self._conf.VAD_SIZE
+        frame_len = int(self._conf.SAMPLE_RATE * self._conf.VAD_SIZE / 1000)
+        self._ring = np.empty((buffer_frames, frame_len), dtype=np.float32)
+        self._ring_head = 0
+        self._ring_count = 0
+
         self.recording_started = False
-        self.gap_counter = 0
+
+        # Rolling window of per-frame VAD results covering the pause limit; end of
+        # utterance is a single vectorized check over it rather than a counter.
+        self._vad_hist = np.ones(
+            self._conf.PAUSE_LIMIT // self._conf.VAD_SIZE, dtype=bool
+        )
+
         self.wake_word = self._conf.WAKE_WORD
+        self.wake_word_lc = self.wake_word.lower() if self.wake_word else None
 
-        self.messages = copy.deepcopy(self._conf.INITIAL_MESSAGES)
+        # A shallow dict copy per message is all that is needed to keep the config's
+        # INITIAL_MESSAGES pristine; deepcopy walked the whole structure for nothing.
+        self.messages = [dict(m) for m in self._conf.INITIAL_MESSAGES]
         self.llm_queue = queue.Queue()
         self.tts_queue = queue.Queue()
         self.processing = False
 
         self.shutdown_event = threading.Event()
+        self._barge_in = threading.Event()
+
+        # TTS playback state: an explicit output stream whose callback drains a
+        # deque of waveform chunks and counts the frames actually delivered,
+        # signalling _tts_done when it goes inactive.
+        self._tts_done = threading.Event()
+        self._playback_stream = None
+        self._playback_chunks = deque()
+        self._playback_offset = 0
+        self._playback_complete = False
+        self._frames_played = 0
+        self._frames_submitted = 0
+
+        # Compile the prompt template once through an environment that never
+        # re-parses it; rendering streams the pieces via generate() rather than
+        # building intermediate copies of the whole prompt.
+        template_env = Environment(
+            loader=BaseLoader(), auto_reload=False, optimized=True
+        )
+        self.template = template_env.from_string(self._conf.LLAMA3_TEMPLATE)
+
+        # One anchored regex strips a trailing stopword in a single pass, instead of
+        # a removesuffix() call per stopword per sentence. Longest first, so e.g.
+        # "<|eot_id|>" wins over "eot_id".
+        stopwords = sorted(self._conf.LLM_STOPWORDS, key=len, reverse=True)
+        self._stopword_re = re.compile(
+            "(?:" + "|".join(map(re.escape, stopwords)) + ")$"
+        )
 
-        self.template = Template(self._conf.LLAMA3_TEMPLATE)
+        # A single ASR worker: transcription runs off the listening thread so the
+        # mic never goes deaf, and one worker keeps the (thread-unsafe) ASR model
+        # on a single thread.
+        self._asr_pool = ThreadPoolExecutor(max_workers=1)
 
-        llm_thread = threading.Thread(target=self.process_LLM)
+        # Workers block on their queues rather than polling with timeouts; shutdown
+        # is a None sentinel per queue. Daemon threads, so a blocked socket read
+        # can't keep the process alive after a KeyboardInterrupt.
+        vad_thread = threading.Thread(target=self._vad_worker, daemon=True)
+        vad_thread.start()
+
+        llm_thread = threading.Thread(target=self.process_LLM, daemon=True)
         llm_thread.start()
 
-        tts_thread = threading.Thread(target=self.process_TTS_thread)
+        tts_thread = threading.Thread(target=self.process_TTS_thread, daemon=True)
         tts_thread.start()
 
         audio = self.tts.generate_speech_audio(self._conf.START_ANNOUNCEMENT)
@@ -87,11 +167,21 @@ class Glados:
     def _setup_audio_stream(self):
         """
         Sets up the audio input stream with sounddevice.
+
+        Also preallocates the pool of frame buffers the audio callback copies into,
+        so the real-time callback never allocates a fresh ndarray.
         """
+        frame_len = int(self._conf.SAMPLE_RATE * self._conf.VAD_SIZE / 1000)
+        self._frame_pool = np.empty((FRAME_POOL_SIZE, frame_len), dtype=np.float32)
+        self._free_frames = queue.Queue(maxsize=FRAME_POOL_SIZE)
+        for idx in range(FRAME_POOL_SIZE):
+            self._free_frames.put(idx)
+
         try:
             self.input_stream = sd.InputStream(
                 samplerate=self._conf.SAMPLE_RATE,
                 channels=1,
+                dtype="float32",  # Keep the whole audio path in float32; no hidden float64 promotion
                 callback=self.audio_callback,
                 blocksize=int(self._conf.SAMPLE_RATE * self._conf.VAD_SIZE / 1000),
             )
@@ -135,14 +225,67 @@ class Glados:
         if not running:
             logger.warning("Llama server does not appear to be running; attempting to continue as it may recover.")
 
+        # Ask the server for the ids of the pause characters once, so sentence
+        # boundaries in the stream can be spotted with a single integer set lookup
+        # when the server sends token ids. Only characters that tokenize to exactly
+        # one id are usable this way.
+        pause_ids = set()
+        for char in _PAUSE_CHARS:
+            ids = self.llama.tokenize(char)
+            if ids is not None and len(ids) == 1:
+                pause_ids.add(ids[0])
+        self._pause_token_ids = frozenset(pause_ids)
+
     def audio_callback(self, indata, frames, time, status):
         """
-        Callback function for the audio stream, processing incoming data.
+        Callback function for the audio stream, handing incoming data off to the VAD worker.
+
+        This runs on PortAudio's real-time thread, so it must do as little as possible:
+        any VAD latency spike here (GIL contention with the LLM/TTS threads, ONNX thread
+        pool, GC) would risk xruns and dropped frames. The frame is copied into a
+        preallocated pool slot rather than a fresh ndarray, so this path allocates nothing.
+        """
+        try:
+            idx = self._free_frames.get_nowait()
+        except queue.Empty:
+            return  # The VAD worker has stalled badly; drop the frame rather than block
+        np.copyto(self._frame_pool[idx], indata[:, 0])
+        self.raw_queue.put(idx)
+
+    def _vad_worker(self):
+        """
+        Runs VAD inference on raw audio frames, off the real-time audio callback thread.
+
+        Consumes pooled frame indices from the audio callback and produces
+        (frame_index, vad_confidence) pairs for the main listening loop, which owns
+        returning the slot to the free pool.
+
+        Frames are scored VAD_BATCH_FRAMES at a time in a single session run,
+        trading a little detection latency for far fewer inference launches; a lull
+        in input flushes any partial batch.
+        """
+        pending = []
+        while not self.shutdown_event.is_set():
+            try:
+                idx = self.raw_queue.get(timeout=self._conf.PAUSE_TIME)
+            except queue.Empty:
+                if pending:
+                    self._flush_vad_batch(pending)
+                continue
+            pending.append(idx)
+            if len(pending) >= self._conf.VAD_BATCH_FRAMES:
+                self._flush_vad_batch(pending)
+
+    def _flush_vad_batch(self, pending):
+        """
+        Runs VAD over the pending pooled frames and emits their confidences.
         """
-        data = indata.copy()
-        data = data.squeeze()  # Reduce to single channel if necessary
-        vad_confidence = self.vad_model.process_chunk(data) > self._conf.VAD_THRESHOLD
-        self.sample_queue.put((data, vad_confidence))
+        confidences = self.vad_model.process_chunk_batch(
+            [self._frame_pool[idx] for idx in pending]
+        )
+        for idx, confidence in zip(pending, confidences):
+            self.sample_queue.put((idx, confidence > self._conf.VAD_THRESHOLD))
+        pending.clear()
 
     def start(self):
         """
@@ -164,11 +307,16 @@ class Glados:
             while (
                 True
             ):  # Loop forever, but is 'paused' when new samples are not available
-                sample, vad_confidence = self.sample_queue.get()
-                self._handle_audio_sample(sample, vad_confidence)
+                idx, vad_confidence = self.sample_queue.get()
+                try:
+                    self._handle_audio_sample(self._frame_pool[idx], vad_confidence)
+                finally:
+                    self._free_frames.put(idx)
         except KeyboardInterrupt:
             self.llama.stop()
             self.shutdown_event.set()
+            self.llm_queue.put(None)  # Wake the workers so they see the shutdown
+            self.tts_queue.put(None)
 
     def _handle_audio_sample(self, sample, vad_confidence):
         """
@@ -190,9 +338,10 @@ class Glados:
 
     def _manage_pre_activation_buffer(self, sample, vad_confidence):
         """
-        Manages the circular buffer of audio samples before activation (i.e., before the voice is detected).
+        Manages the ring buffer of audio samples before activation (i.e., before the voice is detected).
 
-        If the buffer is full, the oldest sample is discarded to make room for new ones.
+        The ring buffer is preallocated, so writing a frame overwrites the oldest one
+        once the buffer is full; no per-frame allocation or locking happens here.
 
         If voice activity is detected, the audio stream is stopped, and the processing is turned off
         to prevent overlap with the LLM and TTS threads.
@@ -201,16 +350,24 @@ class Glados:
             sample (np.ndarray): The audio sample to process.
             vad_confidence (bool): Whether voice activity is detected in the sample.
         """
-        if self.buffer.full():
-            self.buffer.get()  # Discard the oldest sample to make room for new ones
-        self.buffer.put(sample)
+        self._ring[self._ring_head] = sample
+        self._ring_head = (self._ring_head + 1) % len(self._ring)
+        self._ring_count = min(self._ring_count + 1, len(self._ring))
 
         if vad_confidence:  # Voice activity detected
             sd.stop()  # Stop the audio stream to prevent overlap
             self.processing = (
                 False  # Turns off processing on threads for the LLM and TTS!!!
             )
-            self.samples = list(self.buffer.queue)
+            self._barge_in.set()  # Wake the TTS thread immediately if it is playing
+            self._stop_playback()
+            # Copy the pre-roll (oldest to newest) into the utterance buffer
+            first = self._ring[self._ring_head : self._ring_count].reshape(-1)
+            second = self._ring[: self._ring_head].reshape(-1)
+            self._utt_buf[: first.size] = first
+            self._utt_buf[first.size : first.size + second.size] = second
+            self._utt_off = first.size + second.size
+            self._vad_hist[:] = True  # A full pause window must elapse before processing
             self.recording_started = True
 
     def _process_activated_audio(self, sample: np.ndarray, vad_confidence: bool):
@@ -221,40 +378,96 @@ class Glados:
         ensure that the entire sentence is captured before processing, including slight gaps.
         """
 
-        self.samples.append(sample)
+        # The sample is a view into the frame pool, whose slot is recycled as soon
+        # as this handler returns, so it is copied straight into the utterance buffer.
+        end = self._utt_off + sample.size
+        if end > self._utt_buf.size:
+            logger.warning("Utterance buffer full. Processing what has been recorded so far...")
+            self._process_detected_audio(trim_trailing_silence=False)
+            return
+        self._utt_buf[self._utt_off : end] = sample
+        self._utt_off = end
 
-        if not vad_confidence:
-            self.gap_counter += 1
-            if self.gap_counter >= self._conf.PAUSE_LIMIT // self._conf.VAD_SIZE:
-                self._process_detected_audio()
-        else:
-            self.gap_counter = 0
+        # Shift this frame's VAD result into the rolling window; the utterance ends
+        # once the whole pause window is silent.
+        self._vad_hist[:-1] = self._vad_hist[1:]
+        self._vad_hist[-1] = vad_confidence
+        if not self._vad_hist.any():
+            self._process_detected_audio()
 
     def _wakeword_detected(self, text: str) -> bool:
         """
         Calculates the nearest Levenshtein distance from the detected text to the wake word.
 
         This is used as 'Glados' is not a common word, and Whisper can sometimes mishear it.
+
+        rapidfuzz runs the whole comparison loop in C with early termination, instead
+        of one Python-level Levenshtein call per word.
         """
-        words = text.split()
-        closest_distance = min(
-            [distance(word.lower(), self.wake_word) for word in words]
+        return (
+            fuzz_process.extractOne(
+                self.wake_word_lc,
+                text.lower().split(),
+                scorer=Levenshtein.distance,
+                score_cutoff=self._conf.SIMILARITY_THRESHOLD - 1,
+            )
+            is not None
         )
-        return closest_distance < self._conf.SIMILARITY_THRESHOLD
 
-    def _process_detected_audio(self):
+    def _process_detected_audio(self, trim_trailing_silence=True):
         """
-        Processes the detected audio and generates a response.
+        Hands the detected audio to the ASR worker and resumes listening at once.
 
         This function is called when the pause limit is reached after the voice stops.
-        It transcribes the audio and checks for the wake word if it is set. If the wake
-        word is detected, the detected text is sent to the LLM model for processing.
-        The audio stream is then reset, and listening continues.
+        Transcription runs on the ASR worker thread, so the microphone is never deaf
+        while Whisper works; the recorder is reset immediately and the next utterance
+        can begin straight away. The wake-word check and LLM handoff happen in
+        _on_asr_done when the transcription completes.
+
+        When triggered by the pause limit, the tail of the recording is by
+        definition silence, so it is trimmed (bar one frame of padding) to save the
+        ASR from chewing on up to PAUSE_LIMIT ms of nothing.
         """
         logger.debug("Detected pause after speech. Processing...")
-        self.input_stream.stop()
+        self._barge_in.clear()  # The interruption (if any) is now a new utterance
+
+        utt_end = self._utt_off
+        if trim_trailing_silence:
+            frame_len = self._frame_pool.shape[1]
+            utt_end = max(frame_len, utt_end - (len(self._vad_hist) - 1) * frame_len)
+
+        # Snapshot the utterance: the buffer is reused for the next one immediately.
+        audio = self._utt_buf[:utt_end].copy()
+        future = self._asr_pool.submit(self.asr, audio)
+        future.add_done_callback(self._on_asr_done)
+
+        self.reset()
+
+    def _on_asr_done(self, future):
+        """
+        Handles a finished transcription: hallucination filtering, the wake-word
+        check if one is set, and handing the text to the LLM queue.
+
+        Runs on the ASR worker thread. If the user has already started the next
+        utterance by the time this transcription lands, it must not flip the
+        processing flag back on or start an answer — that would override the
+        barge-in and play TTS straight into the live recording.
+        """
+        if self.recording_started:
+            logger.info("New utterance started before transcription finished; dropping the old one.")
+            return
+
+        try:
+            detected_text = future.result()
+        except Exception as e:
+            logger.error(f"ASR failed: {e!r}")
+            self.processing = True
+            return
+
+        if self.recording_started:
+            logger.info("New utterance started during transcription; dropping the old one.")
+            return
 
-        detected_text = self.asr(self.samples)
         hallucination = detected_text and any(hallucination.lower() == detected_text.lower() for hallucination in self._conf.STT_HALLUCINATIONS)
 
         if detected_text and not hallucination:
@@ -279,15 +492,10 @@ class Glados:
             logger.info("Heard audio, but didn't detect any speech within it.")
             self.processing = True
 
-        self.reset()
-        self.input_stream.start()
-
-    def asr(self, samples: List[np.ndarray]) -> str:
+    def asr(self, audio: np.ndarray) -> str:
         """
-        Performs automatic speech recognition on the collected samples.
+        Performs automatic speech recognition on the recorded utterance.
         """
-        audio = np.concatenate(samples)
-
         detected_text = self.asr_model.transcribe(audio)
         return detected_text
 
@@ -297,10 +505,10 @@ class Glados:
         """
         logger.debug("Resetting recorder...")
         self.recording_started = False
-        self.samples.clear()
-        self.gap_counter = 0
-        with self.buffer.mutex:
-            self.buffer.queue.clear()
+        self._utt_off = 0
+        self._vad_hist[:] = True
+        self._ring_head = 0
+        self._ring_count = 0
 
     def process_TTS_thread(self):
         """
@@ -320,60 +528,97 @@ class Glados:
         )
 
         while not self.shutdown_event.is_set():
-            try:
-                generated_text = self.tts_queue.get(timeout=self._conf.PAUSE_TIME)
-
-                if generated_text == "<EOS>":  # End of stream token generated in process_LLM_thread
-                    finished = True
-                elif not generated_text:
-                    logger.warning("Empty string sent to TTS")  # should not happen!
-                else:
-                    logger.success(f"TTS text: {generated_text}")
-                    audio = self.tts.generate_speech_audio(generated_text)
-                    total_samples = len(audio)
-
-                    if total_samples:
-                        sd.play(audio, tts.RATE)
+            generated_text = self.tts_queue.get()
+
+            if generated_text is None:  # Shutdown sentinel
+                break
+            elif generated_text == "<EOS>":  # End of stream token generated in process_LLM_thread
+                finished = True
+            elif not generated_text:
+                logger.warning("Empty string sent to TTS")  # should not happen!
+            else:
+                # Coalesce short sentences already waiting in the queue into one
+                # synthesis call, amortizing per-call overhead. Bounded by sentence
+                # and character budgets so first-audio latency stays low.
+                batch = [generated_text]
+                total_chars = len(generated_text)
+                while (
+                    self.processing
+                    and len(batch) < self._conf.TTS_BATCH_MAX_SENTENCES
+                    and total_chars < self._conf.TTS_BATCH_MAX_CHARS
+                ):
+                    try:
+                        next_text = self.tts_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if next_text is None:
+                        self.tts_queue.put(next_text)  # Re-queue the shutdown sentinel
+                        break
+                    if next_text == "<EOS>":
+                        finished = True
+                        break
+                    if not next_text:
+                        logger.warning("Empty string sent to TTS")  # should not happen!
+                        continue
+                    batch.append(next_text)
+                    total_chars += len(next_text)
+
+                generated_text = "".join(batch)  # sentences already end with a space
+                logger.success(f"TTS text: {generated_text}")
+
+                # Stream synthesis into the playback session: playback starts as
+                # soon as the first sentence's audio is ready, while the rest of
+                # the batch is still being synthesized.
+                self._begin_playback()
+                for batch_text in batch:
+                    if not self.processing:
+                        break
+                    for chunk in self.tts.generate_speech_audio_stream(batch_text):
+                        self._feed_playback(chunk)
+                self._finish_playback()
+
+                total_samples = self._frames_submitted
+
+                if total_samples:
+                    interrupted, percentage_played = self.percentage_played(
+                        total_samples
+                    )
 
-                        interrupted, percentage_played = self.percentage_played(
-                            total_samples
+                    if interrupted:
+                        clipped_text = self.clip_interrupted_sentence(
+                            generated_text, percentage_played
                         )
 
-                        if interrupted:
-                            clipped_text = self.clip_interrupted_sentence(
-                                generated_text, percentage_played
-                            )
-
-                            logger.info(
-                                f"TTS interrupted at {percentage_played}%: {clipped_text}"
-                            )
-                            system_text = copy.deepcopy(assistant_text)
-                            system_text.append(clipped_text)
-                            finished = True
-
-                        assistant_text.append(generated_text)
-
-                if finished:
-                    if isinstance(assistant_text, list):
-                        logger.warning("assistant_text is a list, somehow. Seems to relate to EOS tokens. Working around it.")
-                        assistant_text = assistant_text[0]
+                        logger.info(
+                            f"TTS interrupted at {percentage_played}%: {clipped_text}"
+                        )
+                        system_text = copy.deepcopy(assistant_text)
+                        system_text.append(clipped_text)
+                        finished = True
 
+                    assistant_text.extend(batch)
+                else:
+                    # Nothing was synthesized; let the empty session stop and close it
+                    self._tts_done.wait(timeout=1.0)
+                    self._close_playback()
+
+            if finished:
+                # An <EOS> can arrive with nothing spoken (e.g. queued behind a
+                # barge-in flush); don't record an empty assistant turn for it.
+                if assistant_text:
                     self.messages.append(
                         {"role": "assistant", "content": " ".join(assistant_text)}
                     )
-                    # if interrupted:
-                    #     self.messages.append(
-                    #         {
-                    #             "role": "system",
-                    #             "content": f"USER INTERRUPTED GLADOS, TEXT DELIVERED: {' '.join(system_text)}",
-                    #         }
-                    #     )
-                    assistant_text = []
-                    finished = False
-                    interrupted = False
-
-            except queue.Empty:
-                pass
+                # if interrupted:
+                #     self.messages.append(
+                #         {
+                #             "role": "system",
+                #             "content": f"USER INTERRUPTED GLADOS, TEXT DELIVERED: {' '.join(system_text)}",
+                #         }
+                #     )
+                assistant_text = []
+                finished = False
+                interrupted = False
 
     def clip_interrupted_sentence(self, generated_text, percentage_played):
         """
@@ -398,111 +643,228 @@ class Glados:
             text = text + "<INTERRUPTED>"
         return text
 
+    def _begin_playback(self):
+        """
+        Opens the output stream for a playback session that is fed chunk by chunk.
+
+        The stream callback drains the chunk deque and advances
+        self._frames_played, so playback progress comes from the frames actually
+        delivered rather than being inferred from wall-clock time. If synthesis
+        falls behind, silence is played (uncounted) until the next chunk lands;
+        the stream stops once the session is complete and drained. The finished
+        callback fires whether the stream drains naturally or is aborted by a
+        barge-in.
+        """
+        self._playback_chunks = deque()
+        self._playback_offset = 0
+        self._playback_complete = False
+        self._frames_played = 0
+        self._frames_submitted = 0
+        self._tts_done.clear()
+
+        def callback(outdata, frames, time, status):
+            filled = 0
+            while filled < frames and self._playback_chunks:
+                chunk = self._playback_chunks[0]
+                take = min(frames - filled, len(chunk) - self._playback_offset)
+                outdata[filled : filled + take] = chunk[
+                    self._playback_offset : self._playback_offset + take
+                ]
+                filled += take
+                self._playback_offset += take
+                if self._playback_offset >= len(chunk):
+                    self._playback_chunks.popleft()
+                    self._playback_offset = 0
+            self._frames_played += filled
+            if filled < frames:
+                outdata[filled:] = 0
+                if self._playback_complete:
+                    raise sd.CallbackStop
+
+        self._playback_stream = sd.OutputStream(
+            samplerate=tts.RATE,
+            channels=1,
+            dtype="float32",
+            callback=callback,
+            finished_callback=self._tts_done.set,
+        )
+        self._playback_stream.start()
+
+    def _feed_playback(self, chunk):
+        """
+        Appends a waveform chunk to the in-flight playback session.
+        """
+        chunk = np.asarray(chunk, dtype=np.float32)
+        if chunk.ndim == 1:
+            chunk = chunk[:, np.newaxis]
+        self._frames_submitted += len(chunk)
+        self._playback_chunks.append(chunk)
+
+    def _finish_playback(self):
+        """
+        Marks the playback session complete; the stream stops once drained.
+        """
+        self._playback_complete = True
+
+    def _close_playback(self):
+        """
+        Closes the output stream of a finished playback session.
+        """
+        stream = self._playback_stream
+        self._playback_stream = None
+        if stream is not None:
+            stream.close()
+
+    def _stop_playback(self):
+        """
+        Aborts any in-flight TTS playback. Safe to call from the listening thread;
+        aborting fires the stream's finished callback, waking percentage_played.
+        """
+        stream = self._playback_stream
+        if stream is not None:
+            try:
+                stream.abort()
+            except sd.PortAudioError as e:
+                logger.warning(f"PortAudioError stopping playback: {e!r}. Ignoring.")
+
     def percentage_played(self, total_samples):
-        interrupted = False
-        start_time = time.time()
-        played_samples = 0
+        """
+        Waits until playback finishes or the user barges in, and reports progress.
 
-        try:
-            while sd.get_stream().active:
-                time.sleep(self._conf.PAUSE_TIME)  # Should the TTS stream should still be active?
-                if self.processing is False:
-                    sd.stop()  # Stop the audio stream
-                    self.tts_queue = queue.Queue()  # Clear the TTS queue
-                    interrupted = True
-                    break
-        except sd.PortAudioError as e:
-            logger.warning(f"PortAudioError during playback: {e!r}. Ignoring.")
+        Progress is the exact number of frames the output callback delivered, so
+        the clipped transcript after an interruption is deterministic instead of
+        depending on a wall-clock estimate.
+        """
+        # Generous margin: the stream may also have played (uncounted) silence
+        # while waiting for synthesis to catch up.
+        self._tts_done.wait(timeout=total_samples / tts.RATE + 5.0)
+
+        interrupted = self._barge_in.is_set()
+        if interrupted:
+            self._drain_tts_queue()
+            self._barge_in.clear()
 
-        elapsed_time = (
-            time.time() - start_time + 0.12
-        )  # slight delay to ensure all audio timing is correct
-        played_samples = elapsed_time * tts.RATE
+        self._close_playback()
 
         # Calculate percentage of audio played
-        percentage_played = min(int((played_samples / total_samples * 100)), 100)
+        percentage_played = min(int(self._frames_played / total_samples * 100), 100)
         return interrupted, percentage_played
 
+    def _drain_tts_queue(self):
+        """
+        Discards everything queued for the TTS, in place.
+
+        Swapping in a fresh queue.Queue would strand any thread already blocked on
+        the old object; draining keeps every reference to the queue valid. The
+        shutdown sentinel is put back if it turns up mid-drain.
+        """
+        while True:
+            try:
+                item = self.tts_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self.tts_queue.put(item)
+                break
+
     def process_LLM(self):
         """
         Processes the detected text using the LLM model.
 
         """
         while not self.shutdown_event.is_set():
-            try:
-                detected_text = self.llm_queue.get(timeout=0.1)
+            detected_text = self.llm_queue.get()
+
+            if detected_text is None:  # Shutdown sentinel
+                break
 
-                self.messages.append({"role": "user", "content": detected_text})
+            self.messages.append({"role": "user", "content": detected_text})
 
-                prompt = self.template.render(
+            # Cap the rolling history, or the prompt (and the server's prefill
+            # work) grows without bound as the conversation goes on. The system
+            # prompt is always kept; the oldest turns after it are dropped.
+            overflow = len(self.messages) - self._conf.MESSAGE_HISTORY_LIMIT
+            if overflow > 0:
+                del self.messages[1 : 1 + overflow]
+
+            prompt = "".join(
+                self.template.generate(
                     messages=self.messages,
                     bos_token="<|begin_of_text|>",
                     add_generation_prompt=True,
                 )
+            )
 
-                data = {
-                    "stream": True,
-                    "prompt": prompt,
-                    # "stop": ["\n", "<|im_end|>"],
-                    # "messages": self.messages,
-                }
-                logger.debug(f"starting request on {self.messages=}")
-                logger.debug("Perfoming request to LLM server...")
-
-                # Perform the request and process the stream
-                try:
-                    with self.llama.request(
-                        json=data,
-                        stream=True,
-                    ) as response:
-                        if not response.ok:
-                            logger.error(f"Couldn't obtain a response from the LLM this time; ignoring.")
-                            continue
-
-                        else:
-                            logger.info(f"Got successful response from AI: {response.text!r}")
-
-                        sentence = []
-                        for line in response.iter_lines():
-                            if self.processing is False:
-                                break  # If the stop flag is set from new voice input, halt processing
-                            if line:  # Filter out empty keep-alive new lines
-                                line = self._clean_raw_bytes(line)
-                                next_token = self._process_line(line)
-                                if next_token:
-                                    sentence.append(next_token)
-                                    # If there is a pause token, send the sentence to the TTS queue
-                                    if next_token in [".", "!", "?", ":", ";", "?!"]:
-                                        self._process_sentence(sentence)
-                                        sentence = []
-
-                        if self.processing and sentence:
-                            self.tts_queue.put(sentence)
-
-                        self.tts_queue.put("<EOS>")  # Add end of stream token to the queue
-
-                except requests.exceptions.ConnectionError as e:
-                    logger.error("Couldn't connect to AI endpoint at this time. Is it still loading?")
-
-            except queue.Empty:
-                time.sleep(self._conf.PAUSE_TIME)
-
-    def _process_sentence(self, current_sentence):
-        """
-        Join text, remove inflections and actions, and send to the TTS queue.
+            data = {
+                "stream": True,
+                "return_tokens": True,  # Include token ids alongside content, where supported
+                "cache_prompt": True,  # Let llama.cpp reuse its KV cache for the shared prompt prefix
+                "prompt": prompt,
+                # "stop": ["\n", "<|im_end|>"],
+                # "messages": self.messages,
+            }
+            logger.debug(f"starting request on {self.messages=}")
+            logger.debug("Perfoming request to LLM server...")
+
+            # Perform the request and process the stream
+            try:
+                with self.llama.request(
+                    json=data,
+                    stream=True,
+                ) as response:
+                    if not response.ok:
+                        logger.error(f"Couldn't obtain a response from the LLM this time; ignoring.")
+                        continue
+
+                    else:
+                        # Don't touch response.text here: on a streaming response it
+                        # buffers the entire body, defeating the token streaming below.
+                        logger.info(f"Got successful response from AI: status {response.status_code}")
+
+                    sentence = StringIO()
+                    # A larger chunk size cuts the number of socket reads per
+                    # response; lines are still yielded as soon as they arrive.
+                    for line in response.iter_lines(chunk_size=8192):
+                        if self.processing is False:
+                            break  # If the stop flag is set from new voice input, halt processing
+                        if line:  # Filter out empty keep-alive new lines
+                            line = self._clean_raw_bytes(line)
+                            next_token = self._process_line(line)
+                            if next_token:
+                                sentence.write(next_token)
+                                # If there is a pause token, send the sentence to the
+                                # TTS queue. A hit on the precomputed token-id set
+                                # short-circuits the character check; the character
+                                # check still covers servers that don't stream ids and
+                                # tokens with the punctuation merged into a word.
+                                token_ids = line.get("tokens")
+                                if (
+                                    token_ids
+                                    and not self._pause_token_ids.isdisjoint(token_ids)
+                                ) or next_token[-1] in _PAUSE_CHARS:
+                                    self._process_sentence(sentence.getvalue())
+                                    sentence = StringIO()
+
+                    leftover = sentence.getvalue()
+                    if self.processing and leftover:
+                        self._process_sentence(leftover)
+
+                    self.tts_queue.put("<EOS>")  # Add end of stream token to the queue
+
+            except requests.exceptions.ConnectionError as e:
+                logger.error("Couldn't connect to AI endpoint at this time. Is it still loading?")
+
+    def _process_sentence(self, sentence):
+        """
+        Remove inflections and actions from the sentence, and send it to the TTS queue.
 
         The LLM like to *whisper* things or (scream) things, and prompting is not a 100% fix.
         We use regular expressions to remove text between ** and () to clean up the text.
         Finally, we remove any non-alphanumeric characters/punctuation and send the text
         to the TTS queue.
         """
-        sentence = "".join(current_sentence)
-
-        for stopword in self._conf.LLM_STOPWORDS:
-            sentence = sentence.removesuffix(stopword)
-
-        sentence = re.sub(r"\*.*?\*|\(.*?\)", "", sentence)
-        sentence = re.sub(r"[^a-zA-Z0-9.,?!;:'\" -]", "", sentence)
+        sentence = self._stopword_re.sub("", sentence)
+        sentence = _RE_SENTENCE_CLEANUP.sub("", sentence)
         sentence = sentence + " "  # Add a space to the end of the sentence, for better TTS
 
         if sentence:
@@ -529,15 +891,15 @@ class Glados:
         """
         Cleans the raw bytes from the LLM server for processing.
 
-        Coverts the bytes to a dictionary.
+        Coverts the bytes to a dictionary. orjson parses the bytes directly, so no
+        intermediate str is built for every streamed token.
 
         Args:
             line (bytes): The raw bytes from the LLM server.
         """
-        line = line.decode("utf-8")
-        line = line.removeprefix("data: ")
-        line = json.loads(line)
-        return line
+        if line.startswith(_SSE_DATA_PREFIX):
+            line = line[len(_SSE_DATA_PREFIX):]
+        return orjson.loads(line)
 
 
 def load_config() -> config.Config:
@@ -34,7 +34,9 @@ class ASR:
         because it's a C++ class.
         """
 
-        # Run the model
+        # Run the model. whisper.cpp reads the buffer as raw c_float, so anything
+        # other than contiguous float32 here would be garbage, not just slow.
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
         whisper_cpp_audio = audio.ctypes.data_as(ctypes.POINTER(ctypes.c_float))
         result = whisper_cpp_wrapper.whisper_full(
             self.ctx, self.params, whisper_cpp_audio, len(audio)
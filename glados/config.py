@@ -40,11 +40,18 @@ class Config:
     ))
 
     PAUSE_TIME = 0.05  # Time to wait between processing loops
+
+    TTS_BATCH_MAX_SENTENCES = 4  # Max queued sentences coalesced into one TTS call
+    TTS_BATCH_MAX_CHARS = 280  # Char budget for a coalesced TTS batch, to bound first-audio latency
     SAMPLE_RATE = 16000  # Sample rate for input stream
     VAD_SIZE = 50  # Milliseconds of sample for Voice Activity Detection (VAD)
     VAD_THRESHOLD = 0.15  # Threshold for VAD detection
+    VAD_BATCH_FRAMES = 2  # Frames scored per VAD inference; each extra frame adds VAD_SIZE ms of latency
     BUFFER_SIZE = 600  # Milliseconds of buffer before VAD detection
     PAUSE_LIMIT = 400  # Milliseconds of pause allowed before processing
+    MAX_UTTERANCE_SECONDS = 30  # Capacity of the preallocated utterance buffer handed to the ASR
+
+    MESSAGE_HISTORY_LIMIT = 24  # Max messages kept in the rolling conversation (the system prompt always stays)
 
     WAKE_WORD = None  # You can use a word here, like "computer", for activation
     SIMILARITY_THRESHOLD = 2  # Threshold for wake word similarity
@@ -16,6 +16,16 @@ class BaseLlamaServer:
         self._server_base_url = server_base_url
         self._request_headers = request_headers
 
+        # One pooled keep-alive connection reused for every request to the server,
+        # instead of a fresh TCP handshake per health check and per completion.
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=1, pool_block=True
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers["Connection"] = "keep-alive"
+
     def start(self):
         pass
 
@@ -25,7 +35,7 @@ class BaseLlamaServer:
     def is_running(self) -> bool:
         try:
             health_url = urljoin(self._server_base_url, "./health")
-            response = requests.get(health_url)
+            response = self._session.get(health_url)
             return response.status_code == 200
 
         except requests.exceptions.ConnectionError:
@@ -57,10 +67,33 @@ class BaseLlamaServer:
 
         return running
 
+    def tokenize(self, content: str) -> Optional[list]:
+        """
+        Asks the server to tokenize a string.
+
+        Returns the token ids, or None if the endpoint is unavailable (older
+        llama.cpp builds, or the server not being up yet).
+        """
+        tokenize_url = urljoin(self._server_base_url, "./tokenize")
+
+        try:
+            response = self._session.post(
+                tokenize_url,
+                headers=self._request_headers,
+                json={"content": content},
+            )
+        except requests.exceptions.ConnectionError:
+            return None
+
+        if not response.ok:
+            return None
+
+        return response.json().get("tokens")
+
     def request(self, json: Dict[str, Any], stream=False) -> Dict[str, Any]:
         generate_url = urljoin(self._server_base_url, "./completion")
 
-        response = requests.post(
+        response = self._session.post(
             generate_url,
             headers=self._request_headers,
             json=json,
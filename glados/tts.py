@@ -444,17 +444,21 @@ class TTSEngine:
         self.phonemizer = Phonemizer()
         self.synthesizer = Synthesizer(model_path, use_cuda)
 
-    def generate_speech_audio(self, text: str) -> bytes:
+    def generate_speech_audio_stream(self, text: str):
+        """Yield the waveform one synthesized sentence at a time.
+
+        Lets the caller start playback as soon as the first sentence's audio is
+        ready, instead of waiting for the whole text to be synthesized.
+        """
         phonemes = self.phonemizer.synthesize_phonemes(text)
-        audio = []
+        for sentence in phonemes or []:
+            yield self.synthesizer.say_phonemes(sentence).T
 
-        if phonemes:
-            for sentence in phonemes:
-                audio_chunk = self.synthesizer.say_phonemes(sentence)
-                audio.append(audio_chunk)
+    def generate_speech_audio(self, text: str) -> bytes:
+        audio = list(self.generate_speech_audio_stream(text))
 
         if audio:
-            audio = np.concatenate(audio, axis=1).T
+            audio = np.concatenate(audio, axis=0)
         return audio
 
 